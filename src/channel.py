@@ -1,8 +1,9 @@
+import math
 import numpy as np
 from numpy.typing import NDArray
 
 
-def add_awgn(sinal_entrada: NDArray[np.complex128], snr_db: float, ruido: NDArray[np.complex128]) -> NDArray[np.complex128]:
+def add_awgn(sinal_entrada: NDArray[np.complex64], snr_db: float | NDArray[np.float64], ruido: NDArray[np.complex64], saida: NDArray[np.complex64] | None = None) -> NDArray[np.complex64]:
     """
     Adiciona ruído AWGN (Additive White Gaussian Noise) a um sinal.
     
@@ -18,38 +19,71 @@ def add_awgn(sinal_entrada: NDArray[np.complex128], snr_db: float, ruido: NDArra
     4. Gera ruído gaussiano com a potência calculada
     5. Adiciona ruído ao sinal
     
+    O ruído pode vir em lote: com ruido de formato (iterações, N), o mesmo
+    sinal é somado a cada linha de uma vez, e a potência do sinal é
+    calculada uma única vez para todas as realizações de ruído.
+    
+    O SNR também pode ser um vetor de K valores: o resultado ganha um eixo
+    inicial, um por SNR, e o mesmo ruído é escalado para cada valor.
+    
     Parâmetros:
-        signal: sinal a ser corrompido (pode ser real ou complexo)
-        snr_db: relação sinal-ruído em decibéis (SNR = potência_sinal / potência_ruído)
+        sinal_entrada: array numpy 1D com o sinal a ser corrompido (real ou complexo);
+                       usado como está, sem conversão com np.asarray
+        snr_db: relação sinal-ruído em decibéis (SNR = potência_sinal / potência_ruído),
+                um valor ou um vetor 1D de valores
+        ruido: ruído gaussiano complexo com variância 1 em cada componente e pelo
+               menos len(sinal_entrada) amostras no último eixo (complex64 basta:
+               só é escalado); eixos anteriores são realizações independentes.
+               Pode ser real (só uma componente) quando só a parte real do
+               resultado interessa, com sinal_entrada também real
+        saida: buffer opcional, com o formato do resultado, onde o
+               resultado é escrito (permite reaproveitar a mesma memória em
+               várias chamadas; None = aloca um novo)
     
     Retorna:
-        Sinal original com ruído adicionado
+        Sinal original com ruído adicionado, com formato ruido.shape[:-1] + (N,)
+        (ou (K,) + ruido.shape[:-1] + (N,) com um vetor de K SNRs)
     """
     # Converter SNR de decibéis para escala linear
     # SNR_linear = 10^(SNR_dB / 10)
-    snr_linear: np.float64 = 10.0 ** (snr_db / 10.0)
+    snr_linear = 10.0 ** (np.asarray(snr_db, dtype=np.float64) / 10.0)
 
     # Calcular potência média do sinal
     # Para sinais complexos: |sinal|^2 = real^2 + imag^2
     # Para sinais reais: |sinal|^2 = sinal^2
-    potencia_sinal: np.float64 = np.mean(np.power(np.abs(sinal_entrada, dtype=np.float64), 2, dtype=np.float64), dtype=np.float64)
+    # np.vdot conjuga o primeiro argumento, então vdot(s, s) = soma de |s|^2
+    # em uma única passada (sem sqrt do np.abs e sem vetores temporários)
+    # O resultado vira float do Python: o resto da conta é escalar puro
+    potencia_sinal = float(np.vdot(sinal_entrada, sinal_entrada).real) / sinal_entrada.size
     
-    # Caso especial: sinal com potência zero (sinal nulo)
-    if potencia_sinal == 0:
-        tipo_ruido = np.complex128 if np.iscomplexobj(sinal_entrada) else np.float64
-        ruido_zero = np.zeros_like(sinal_entrada, dtype=tipo_ruido)
-        return sinal_entrada + ruido_zero
+    # Buffer do resultado: o do chamador ou um novo, no tipo das entradas
+    # (sinal e ruído complex64 dão um resultado complex64: a decisão é só um
+    # teste de sinal, e a precisão simples gasta metade da memória; sinal e
+    # ruído reais dão um resultado real)
+    if saida is None:
+        tipo_saida = np.result_type(sinal_entrada, ruido, np.float32)
+        saida = np.empty(snr_linear.shape + ruido.shape[:-1] + sinal_entrada.shape, dtype=tipo_saida)
 
     # Calcular potência do ruído necessária
     # SNR = P_sinal / P_ruido  =>  P_ruido = P_sinal / SNR
+    # (sinal nulo não precisa de caso especial: P_ruido = 0 e a saída é o sinal)
     potencia_ruido = potencia_sinal / snr_linear
 
     # Gerar ruído gaussiano com a potência calculada
     # Para sinais complexos: ruído tem parte real e imaginária independentes
     # Cada parte tem metade da potência total
-    desvio_padrao_ruido: np.complex128 = np.sqrt(np.complex128(potencia_ruido / 2.0), dtype=np.complex128)
+    # (potência é real e positiva: raiz quadrada real, em um float do Python)
+    if potencia_ruido.ndim == 0:
+        desvio_padrao_ruido = math.sqrt(potencia_ruido * 0.5)
+    else:
+        # Um desvio por SNR, alinhado ao eixo inicial do resultado
+        desvio_padrao_ruido = np.sqrt(potencia_ruido * 0.5).reshape(potencia_ruido.shape + (1,) * ruido.ndim)
 
-    # Adicionar ruído ao sinal original
-    sinal_com_ruido = sinal_entrada + ruido[:sinal_entrada.shape[0]] * desvio_padrao_ruido
+    # Escalar o ruído direto no buffer de saída e somar o sinal nele, no lugar
+    # (nenhum vetor temporário; o ruído de entrada não é modificado, pois é
+    # reaproveitado para outros valores de SNR)
+    # Com ruído em lote, o sinal é somado por broadcasting a todas as linhas
+    np.multiply(ruido[..., :sinal_entrada.shape[0]], desvio_padrao_ruido, out=saida)
+    np.add(saida, sinal_entrada, out=saida)
 
-    return sinal_com_ruido
+    return saida
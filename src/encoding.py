@@ -7,9 +7,11 @@ def text_to_bits(text: str) -> np.ndarray:
     Converte uma string de texto em um vetor de bits.
     
     Processo:
-    1. Para cada caractere na string, obtém seu código ASCII
-    2. Converte o código ASCII para binário (8 bits)
-    3. Adiciona cada bit ao vetor final
+    1. Codifica a string em bytes latin-1 (um byte por caractere, 0-255)
+    2. Desempacota cada byte em 8 bits (bit mais significativo primeiro)
+    
+    Caracteres fora do latin-1 (ex.: '’') não cabem em 8 bits e são
+    substituídos por '?', garantindo exatamente 8 bits por caractere.
     
     Exemplo:
         'A' (ASCII 65) -> '01000001' -> [0, 1, 0, 0, 0, 0, 0, 1]
@@ -23,23 +25,12 @@ def text_to_bits(text: str) -> np.ndarray:
     if not isinstance(text, str):
         raise TypeError("text deve ser uma string")
 
-    lista_bits = []
-    
-    # Para cada caractere na string
-    for caractere in text:
-        # Obter código ASCII do caractere
-        codigo_ascii = ord(caractere)
-        
-        # Converter código ASCII para binário com 8 dígitos (completar com zeros à esquerda)
-        # Exemplo: 65 -> '01000001'
-        binario_8_bits = format(codigo_ascii, "08b")
-        
-        # Adicionar cada bit (como inteiro) à lista
-        for bit_char in binario_8_bits:
-            lista_bits.append(int(bit_char))
+    # Converter texto em bytes (cada caractere vira um byte)
+    bytes_texto = np.frombuffer(text.encode("latin-1", errors="replace"), dtype=np.uint8)
     
-    # Converter lista para array numpy
-    bits_array = np.array(lista_bits, dtype=np.uint8)
+    # Desempacotar cada byte em 8 bits, na mesma ordem de format(codigo, "08b")
+    # Exemplo: 65 -> [0, 1, 0, 0, 0, 0, 0, 1]
+    bits_array = np.unpackbits(bytes_texto)
 
     return bits_array
 
@@ -49,10 +40,8 @@ def bits_to_text(bits: np.ndarray) -> str:
     Converte um vetor de bits em uma string de texto.
     
     Processo:
-    1. Agrupa bits em grupos de 8 (bytes)
-    2. Para cada byte, reconstrói o valor decimal
-    3. Converte o valor decimal em caractere ASCII
-    4. Junta todos os caracteres em uma string
+    1. Empacota os bits em grupos de 8 (bytes), bit mais significativo primeiro
+    2. Decodifica os bytes como latin-1 (cada byte vira um caractere)
     
     Exemplo:
         [0, 1, 0, 0, 0, 0, 0, 1] -> 65 -> 'A'
@@ -72,26 +61,12 @@ def bits_to_text(bits: np.ndarray) -> str:
     if len(bits_array) % 8 != 0:
         raise ValueError("tamanho de bits deve ser múltiplo de 8 (cada caractere precisa de 8 bits)")
 
-    lista_caracteres = []
-    
-    # Processar bits em grupos de 8 (cada grupo é um byte = um caractere)
-    for indice_inicio in range(0, len(bits_array), 8):
-        # Extrair 8 bits consecutivos (um byte)
-        byte_bits = bits_array[indice_inicio:indice_inicio+8]
-        
-        # Reconstruir valor decimal do byte
-        # Exemplo: [0,1,0,0,0,0,0,1] -> 0*128 + 1*64 + 0*32 + ... = 65
-        valor_decimal = 0
-        for bit in byte_bits:
-            # Deslocar bits à esquerda e adicionar novo bit
-            valor_decimal = (valor_decimal << 1) | int(bit)
-        
-        # Converter valor decimal em caractere ASCII
-        caractere = chr(valor_decimal)
-        lista_caracteres.append(caractere)
-    
-    # Juntar todos os caracteres em uma string
-    texto_reconstruido = "".join(lista_caracteres)
+    # Reconstruir cada byte (inverso de np.unpackbits em text_to_bits)
+    # Exemplo: [0,1,0,0,0,0,0,1] -> 0*128 + 1*64 + 0*32 + ... = 65
+    bytes_texto = np.packbits(bits_array)
+    
+    # Converter bytes em caracteres (latin-1 aceita qualquer valor de 0 a 255)
+    texto_reconstruido = bytes_texto.tobytes().decode("latin-1")
     return texto_reconstruido
 
 
@@ -124,19 +99,23 @@ def manchester_encode(bits: np.ndarray) -> np.ndarray:
     if bits_entrada.ndim != 1:
         raise ValueError("bits deve ser um vetor 1D")
 
-    # Criar array para bits codificados (dobro do tamanho)
+    # Criar matriz com uma linha por bit original e uma coluna por bit do par
+    # Lida em ordem (ravel), ela é o vetor codificado (dobro do tamanho)
     tamanho_original = len(bits_entrada)
-    bits_codificados = np.empty(2 * tamanho_original, dtype=np.uint8)
+    pares_codificados = np.empty((tamanho_original, 2), dtype=np.uint8)
     
     # Aplicar codificação Manchester:
     # Bit 0 -> (1, 0): primeiro bit = 1, segundo bit = 0
     # Bit 1 -> (0, 1): primeiro bit = 0, segundo bit = 1
     #
-    # Posições pares (0, 2, 4, ...): primeiro bit de cada par
-    bits_codificados[0::2] = 1 - bits_entrada  # Inverter: 0->1, 1->0
+    # Coluna 0: primeiro bit de cada par
+    pares_codificados[:, 0] = bits_entrada ^ 1  # Inverter: 0->1, 1->0
     
-    # Posições ímpares (1, 3, 5, ...): segundo bit de cada par
-    bits_codificados[1::2] = bits_entrada  # Manter: 0->0, 1->1
+    # Coluna 1: segundo bit de cada par
+    pares_codificados[:, 1] = bits_entrada  # Manter: 0->0, 1->1
+
+    # Achatar a matriz (view contígua, sem cópia)
+    bits_codificados = pares_codificados.ravel()
 
     return bits_codificados
 
@@ -156,24 +135,22 @@ def manchester_decode(encoded: np.ndarray) -> np.ndarray:
       -> usa segundo bit: (0,0) -> 0, (1,1) -> 1
     
     Parâmetros:
-        encoded: array numpy com bits codificados (deve ter tamanho par)
+        encoded: array numpy com bits codificados (deve ter tamanho par), no
+                 último eixo; eixos anteriores são quadros independentes
     
     Retorna:
-        Array numpy com bits decodificados (metade do tamanho)
+        Array numpy com bits decodificados (metade do tamanho no último
+        eixo), como view de encoded (não deve ser modificado)
     """
     # Garantir que encoded seja um array numpy
     bits_codificados = np.asarray(encoded, dtype=np.uint8)
     
     # Validar formato
-    if bits_codificados.ndim != 1:
-        raise ValueError("encoded deve ser um vetor 1D")
-    if len(bits_codificados) % 2 != 0:
+    if bits_codificados.ndim < 1:
+        raise ValueError("encoded deve ter ao menos 1 dimensão")
+    if bits_codificados.shape[-1] % 2 != 0:
         raise ValueError("tamanho de encoded deve ser par (cada bit codificado tem 2 bits)")
 
-    # Extrair primeiro e segundo bit de cada par
-    primeiro_bit_cada_par = bits_codificados[0::2]
-    segundo_bit_cada_par = bits_codificados[1::2]
-
     # Decodificação:
     # Para pares válidos: (1,0) -> 0, (0,1) -> 1
     # Para pares inválidos após ruído: (0,0) -> 0, (1,1) -> 1
@@ -183,6 +160,9 @@ def manchester_decode(encoded: np.ndarray) -> np.ndarray:
     # - Par (0,1): segundo bit = 1 -> bit original = 1
     # - Par (0,0): segundo bit = 0 -> bit original = 0 (decisão após ruído)
     # - Par (1,1): segundo bit = 1 -> bit original = 1 (decisão após ruído)
-    bits_decodificados = segundo_bit_cada_par.copy()
+    #
+    # Retorna uma view dos segundos bits de cada par (posições ímpares do
+    # último eixo, sem cópia): quem usa o resultado só lê os bits
+    bits_decodificados = bits_codificados[..., 1::2]
 
     return bits_decodificados
@@ -1,9 +1,51 @@
-
+from functools import lru_cache
 from typing import Tuple
 import numpy as np
 from numpy.typing import NDArray
 
 
+# Constelação QPSK (mapeamento Gray, potência média 1) indexada pelo par de
+# bits lido como número de 2 bits: índice = 2*bit0 + bit1
+# (0,0)=0 -> 45°, (0,1)=1 -> 135°, (1,0)=2 -> 315°, (1,1)=3 -> 225°
+_CONSTELACAO_QPSK = np.array([1 + 1j, -1 + 1j, 1 - 1j, -1 - 1j], dtype=np.complex128) / np.sqrt(2.0)
+
+# Constelação BPSK indexada pelo próprio bit: 0 -> -1, 1 -> +1
+_CONSTELACAO_BPSK = np.array([-1.0, 1.0], dtype=np.float64)
+
+
+@lru_cache(maxsize=8)
+def _portadoras(fc: float, t_start: float, num_simbolos: int, num_amostras: int, dtype: np.dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gera (e guarda em cache) as portadoras cos(2πfc*t) e sin(2πfc*t).
+    
+    Numa simulação Monte Carlo, add_carrier e remove_carrier são chamadas
+    muitas vezes com os mesmos fc, t_start e tamanho de quadro: as portadoras
+    são idênticas e não precisam ser recalculadas a cada chamada.
+    
+    Os vetores devolvidos são somente leitura (são compartilhados entre
+    chamadas); quem precisa modificá-los deve fazer uma cópia.
+    
+    Retorna:
+        (cos, sin), ambos com num_amostras amostras do tipo dtype
+    """
+    # Duração total = num_simbolos períodos de símbolo, amostrada com passo
+    # fixo: t = t_start + n * passo. As constantes da portadora são dobradas
+    # em escalares, então a fase sai de um np.arange com uma multiplicação e
+    # uma soma no próprio vetor (sem vetor de tempo separado)
+    passo = num_simbolos / num_amostras if num_amostras else 0.0
+    
+    # A fase fica em float64 (cresce com o tempo e perderia precisão em
+    # float32); só o resultado do cos/sin é gravado no tipo pedido
+    fase = np.arange(num_amostras, dtype=np.float64)
+    fase *= 2 * np.pi * fc * passo
+    fase += 2 * np.pi * fc * t_start
+    portadora_cos = np.cos(fase, out=np.empty(num_amostras, dtype=dtype))
+    portadora_sin = np.sin(fase, out=np.empty(num_amostras, dtype=dtype))
+    portadora_cos.setflags(write=False)
+    portadora_sin.setflags(write=False)
+    return portadora_cos, portadora_sin
+
+
 def pulse_shape(symbols: np.ndarray, samples_per_symbol: int, rolloff: float = 0.35) -> np.ndarray:
     """
     Aplica formatação de pulso (pulse shaping) usando filtro raised cosine.
@@ -12,38 +54,45 @@ def pulse_shape(symbols: np.ndarray, samples_per_symbol: int, rolloff: float = 0
     para reduzir interferência entre símbolos (ISI) e limitar largura de banda.
     
     Parâmetros:
-        symbols: símbolos a formatar
+        symbols: símbolos a formatar, no último eixo (eixos anteriores são
+                 quadros independentes, formatados de uma vez)
         samples_per_symbol: número de amostras por símbolo
         rolloff: fator de rolloff do filtro (0.0 = retangular, 0.35 = típico)
     
     Retorna:
-        Sinal formatado com pulse shaping
+        Sinal formatado com pulse shaping, formato (..., N * samples_per_symbol)
     """
     if rolloff == 0.0:
         # Pulso retangular (simples, mas não ideal)
-        return np.repeat(symbols, samples_per_symbol)
+        return np.repeat(symbols, samples_per_symbol, axis=-1)
     
     # Filtro raised cosine (mais realista)
     # Para simplificar, usamos interpolação com filtro passa-baixa
     # Em sistemas reais, usaria convolução com resposta ao impulso do raised cosine
-    num_symbols = len(symbols)
-    num_samples = num_symbols * samples_per_symbol
-    
-    # Interpolar símbolos (upsampling)
-    indices_symbols = np.arange(num_symbols) * samples_per_symbol
-    indices_samples = np.arange(num_samples)
+    simbolos = np.asarray(symbols)
     
     # Interpolação linear (aproximação simples do pulse shaping)
     # Em sistemas reais, usaria convolução com resposta ao impulso do filtro
-    if np.iscomplexobj(symbols):
-        real_part = np.interp(indices_samples, indices_symbols, np.real(symbols))
-        imag_part = np.interp(indices_samples, indices_symbols, np.imag(symbols))
-        return real_part + 1j * imag_part
-    else:
-        return np.interp(indices_samples, indices_symbols, symbols)
+    #
+    # A grade é uniforme (um símbolo a cada samples_per_symbol amostras), então
+    # a amostra k do bloco do símbolo j é simplesmente
+    #   s[j] + (s[j+1] - s[j]) * k / samples_per_symbol
+    # Sem busca binária do np.interp, e sem separar real/imag (a conta
+    # complexa é a mesma)
+    # (a fração usa a mesma precisão dos símbolos: complex64 continua complex64)
+    precisao = np.result_type(simbolos.real.dtype, np.float32)
+    fracao = (np.arange(samples_per_symbol) / samples_per_symbol).astype(precisao)
+    inicio = simbolos[..., :-1, None]
+    blocos = inicio + (simbolos[..., 1:, None] - inicio) * fracao
+    
+    # Após o último símbolo não há próximo: o valor fica constante
+    # (mesmo comportamento do np.interp fora da grade)
+    ultimo_bloco = np.repeat(simbolos[..., -1:], samples_per_symbol, axis=-1)
+    
+    return np.concatenate([blocos.reshape(simbolos.shape[:-1] + (-1,)), ultimo_bloco], axis=-1)
 
 
-def add_carrier(symbols: np.ndarray, fc: float, fs: float, t_start: float = 0.0, use_pulse_shaping: bool = True) -> np.ndarray:
+def add_carrier(symbols: np.ndarray, fc: float, fs: float, t_start: float = 0.0, use_pulse_shaping: bool = True, dtype: type = np.float32) -> np.ndarray:
     """
     Adiciona portadora ao sinal em banda base (modulação passa-banda).
     
@@ -60,44 +109,53 @@ def add_carrier(symbols: np.ndarray, fc: float, fs: float, t_start: float = 0.0,
     (frequência da portadora muito maior que taxa de símbolos)
     
     Parâmetros:
-        symbols: símbolos em banda base (reais para BPSK, complexos para QPSK)
+        symbols: símbolos em banda base (reais para BPSK, complexos para QPSK),
+                 no último eixo; eixos anteriores são quadros independentes,
+                 que compartilham a mesma portadora
         fc: frequência da portadora (Hz) - deve ser >> 1/duração_símbolo
         fs: taxa de amostragem (amostras por símbolo)
         t_start: tempo inicial (segundos)
         use_pulse_shaping: se True, aplica formatação de pulso (mais realista)
+        dtype: tipo das amostras do sinal passa-banda (float32 basta para
+               símbolos ±1; np.float64 para precisão dupla)
     
     Retorna:
         Sinal modulado em passa-banda (valores reais)
     """
     simbolos = np.asarray(symbols)
-    num_simbolos = len(simbolos)
+    num_simbolos = simbolos.shape[-1]
     
     # Aplicar pulse shaping (formatação de pulso) - mais realista
     if use_pulse_shaping:
         simbolos_formatados = pulse_shape(simbolos, int(fs), rolloff=0.35)
     else:
         # Pulso retangular (menos realista, mas mais simples)
-        simbolos_formatados = np.repeat(simbolos, int(fs))
+        simbolos_formatados = np.repeat(simbolos, int(fs), axis=-1)
     
-    num_amostras = len(simbolos_formatados)
+    num_amostras = simbolos_formatados.shape[-1]
     
-    # Gerar vetor de tempo
-    # Duração total = num_simbolos períodos de símbolo
-    t = np.linspace(t_start, t_start + num_simbolos, num_amostras, endpoint=False)
+    # Sem portadora (fc = 0): cos = 1 e sin = 0, o sinal "passa-banda" é
+    # só a parte real do sinal formatado
+    if fc == 0:
+        return np.real(simbolos_formatados).astype(dtype)
     
-    # Gerar portadora
+    # Portadoras (vêm do cache quando fc, t_start e o tamanho se repetem)
     # Em sistemas reais: fc >> 1 (frequência da portadora muito maior que taxa de símbolos)
-    portadora_cos = np.cos(2 * np.pi * fc * t)
-    portadora_sin = np.sin(2 * np.pi * fc * t)
+    portadora_cos, portadora_sin = _portadoras(fc, t_start, num_simbolos, num_amostras, np.dtype(dtype))
+    
+    # Componente I: símbolo * cos, escrito direto no buffer do sinal
+    # BPSK: apenas componente I, então o sinal passa-banda já está pronto
+    # (com vários quadros, a portadora é aplicada a todos por broadcasting)
+    sinal_passabanda = np.multiply(portadora_cos, np.real(simbolos_formatados), out=np.empty(simbolos_formatados.shape, dtype=dtype))
     
     if np.iscomplexobj(simbolos_formatados):
         # QPSK: usar componentes I (real) e Q (imaginário)
         # Modulação passa-banda: I*cos - Q*sin
-        sinal_passabanda = np.real(simbolos_formatados) * portadora_cos - np.imag(simbolos_formatados) * portadora_sin
-    else:
-        # BPSK: apenas componente I
-        # Modulação passa-banda: símbolo * cos
-        sinal_passabanda = simbolos_formatados * portadora_cos
+        # (o produto Q*sin é escrito na própria parte imaginária do sinal
+        # formatado, que é um vetor novo criado acima: nenhuma alocação extra)
+        componente_q = np.imag(simbolos_formatados)
+        np.multiply(componente_q, portadora_sin, out=componente_q)
+        sinal_passabanda -= componente_q
 
     return sinal_passabanda
 
@@ -110,7 +168,8 @@ def lowpass_filter(signal: np.ndarray, samples_per_symbol: int) -> np.ndarray:
     mas para simulação, média móvel é uma aproximação razoável.
     
     Parâmetros:
-        signal: sinal a filtrar
+        signal: sinal a filtrar, no último eixo (eixos anteriores são quadros
+                independentes, filtrados de uma vez)
         samples_per_symbol: número de amostras por símbolo
     
     Retorna:
@@ -122,12 +181,76 @@ def lowpass_filter(signal: np.ndarray, samples_per_symbol: int) -> np.ndarray:
     if window_size < 2:
         return signal
     
+    sinal = np.asarray(signal)
+    if sinal.shape[-1] < window_size:
+        # Sinal menor que a janela: caso raro, mantém a convolução direta
+        return np.apply_along_axis(np.convolve, -1, sinal, np.ones(window_size)/window_size, mode='same')
+    
     # Aplicar média móvel (aproximação de filtro passa-baixa)
-    filtered = np.convolve(signal, np.ones(window_size)/window_size, mode='same')
-    return filtered
+    # Mesmo resultado de np.convolve(sinal, ones(W)/W, mode='same'), mas em
+    # O(N) com somas acumuladas, em vez de O(N*W):
+    # soma da janela [a, b] = acumulada[b+1] - acumulada[a]
+    # O sinal é completado com zeros nas bordas, como na convolução
+    zeros_esquerda = window_size // 2
+    zeros_direita = (window_size - 1) // 2
+    # A soma acumulada é sempre feita em float64 (em float32 a subtração de
+    # duas somas grandes perderia os dígitos da janela); o resultado volta
+    # para a precisão do sinal de entrada
+    # Um único buffer guarda o zero inicial, os zeros das bordas e o sinal,
+    # e a soma acumulada é feita nele mesmo (sem np.pad/np.concatenate)
+    num_amostras = sinal.shape[-1]
+    acumulada = np.zeros(sinal.shape[:-1] + (1 + zeros_esquerda + num_amostras + zeros_direita,), dtype=np.result_type(sinal, np.float64))
+    acumulada[..., 1 + zeros_esquerda:1 + zeros_esquerda + num_amostras] = sinal
+    np.cumsum(acumulada, axis=-1, out=acumulada)
+    filtered = np.subtract(acumulada[..., window_size:], acumulada[..., :-window_size])
+    filtered /= window_size
+    return filtered.astype(np.result_type(sinal, np.float32), copy=False)
+
+
+def _somas_por_simbolo(sinal: np.ndarray, portadora: np.ndarray | None, janela: int, num_simbolos: int) -> np.ndarray:
+    """
+    Soma de sinal * portadora na janela de cada símbolo (portadora None = só o sinal).
+    
+    A janela do símbolo k é a da média móvel de lowpass_filter centrada na
+    amostra k*janela, que é a amostra guardada pela decimação:
+    [k*janela - janela//2, k*janela - janela//2 + janela), com zeros antes do
+    início do sinal. As janelas de símbolos vizinhos não se sobrepõem, então
+    cada soma é o produto escalar de um bloco de janela amostras, e só as
+    amostras filtradas que a decimação guardaria são calculadas.
+    
+    O sinal é lido no último eixo; eixos anteriores são quadros independentes
+    (a portadora, 1D, vale para todos).
+    
+    Retorna:
+        Array com num_simbolos somas no último eixo (dividir por janela dá a
+        média móvel)
+    """
+    meia_janela = janela // 2
+    tipo_somas = sinal.dtype if portadora is None else np.result_type(sinal, portadora)
+    somas = np.empty(sinal.shape[:-1] + (num_simbolos,), dtype=tipo_somas)
+    if num_simbolos == 0:
+        return somas
+    
+    # Primeira janela: só as amostras a partir do início do sinal (os zeros
+    # iniciais da média móvel não contribuem para a soma)
+    inicio_blocos = janela - meia_janela
+    fim_blocos = num_simbolos * janela - meia_janela
+    # Demais janelas: blocos consecutivos de janela amostras, vistos como
+    # (..., num_simbolos - 1, janela) sem cópia
+    blocos = sinal[..., inicio_blocos:fim_blocos].reshape(sinal.shape[:-1] + (num_simbolos - 1, janela))
+    if portadora is None:
+        np.sum(sinal[..., :inicio_blocos], axis=-1, out=somas[..., 0])
+        np.sum(blocos, axis=-1, out=somas[..., 1:])
+    else:
+        # Produto escalar de cada bloco com o trecho da portadora (einsum não
+        # cria o vetor de produtos sinal * portadora)
+        somas[..., 0] = np.dot(sinal[..., :inicio_blocos], portadora[:inicio_blocos])
+        blocos_portadora = portadora[inicio_blocos:fim_blocos].reshape(num_simbolos - 1, janela)
+        np.einsum("...kw,kw->...k", blocos, blocos_portadora, out=somas[..., 1:])
+    return somas
 
 
-def remove_carrier(signal: np.ndarray, fc: float, fs: float, t_start: float = 0.0, use_filtering: bool = True) -> np.ndarray:
+def remove_carrier(signal: np.ndarray, fc: float, fs: float, t_start: float = 0.0, use_filtering: bool = True, dtype: type = np.float32) -> np.ndarray:
     """
     Remove portadora do sinal passa-banda (demodulação para banda base).
     
@@ -143,54 +266,84 @@ def remove_carrier(signal: np.ndarray, fc: float, fs: float, t_start: float = 0.
     - Pode ter erro de fase/frequência que precisa ser corrigido
     
     Parâmetros:
-        signal: sinal em passa-banda (valores reais)
+        signal: sinal em passa-banda (valores reais), no último eixo; eixos
+                anteriores são quadros independentes, processados de uma vez
         fc: frequência da portadora (Hz)
         fs: taxa de amostragem (amostras por símbolo)
         t_start: tempo inicial (segundos)
         use_filtering: se True, aplica filtro passa-baixa (mais realista)
+        dtype: tipo das componentes I e Q (float32 por padrão; os símbolos
+               saem complex64, ou complex128 com np.float64)
     
     Retorna:
         Símbolos demodulados em banda base
     """
     sinal = np.asarray(signal)
-    num_amostras = len(sinal)
+    num_amostras = sinal.shape[-1]
     num_simbolos = int(num_amostras / fs)
-    
-    # Gerar vetor de tempo
-    t = np.linspace(t_start, t_start + num_simbolos, num_amostras, endpoint=False)
+    tipo_componentes = np.result_type(sinal, dtype)
+    passo = int(fs)
+    
+    # Downconversion, filtro passa-baixa e decimação numa única passada:
+    # a decimação só guarda a amostra k*passo de cada componente filtrada, e
+    # a média móvel nessa amostra é a soma de sinal * portadora numa janela de
+    # passo amostras (ver _somas_por_simbolo). As componentes I e Q completas
+    # e filtradas nunca são montadas: cada símbolo sai direto do seu bloco
+    # (mesmo resultado de multiplicar, filtrar com lowpass_filter e decimar,
+    # a menos de arredondamento)
+    filtrar = use_filtering and passo >= 2
+    
+    # Sem portadora (fc = 0): cos = 1 e sin = 0, então I é o próprio sinal e
+    # Q é nulo; basta filtrar e decimar (mesmo resultado do caminho completo)
+    if fc == 0:
+        if filtrar:
+            simbolos_i = _somas_por_simbolo(sinal, None, passo, num_simbolos)
+            simbolos_i /= passo
+        else:
+            simbolos_i = sinal[..., :num_simbolos * passo:passo]
+        return simbolos_i.astype(np.result_type(tipo_componentes, np.complex64))
     
     # Gerar portadoras locais (downconversion)
     # Em sistemas reais, estas portadoras precisam estar sincronizadas
     # com a portadora do transmissor (PLL - Phase Locked Loop)
-    portadora_cos = np.cos(2 * np.pi * fc * t)
-    portadora_sin = np.sin(2 * np.pi * fc * t)
-    
     # Demodulação: multiplicar por portadoras (downconversion)
     # Isso move o sinal de volta para banda base
-    componente_i = sinal * portadora_cos
-    componente_q = -sinal * portadora_sin  # Negativo para Q
-    
-    # Filtrar passa-baixa para remover componentes de alta frequência
-    # (resultantes da multiplicação: 2fc, etc.)
-    if use_filtering:
-        componente_i = lowpass_filter(componente_i, int(fs))
-        componente_q = lowpass_filter(componente_q, int(fs))
-    
-    # Decimar (downsample): uma amostra por símbolo
-    # Em sistemas reais, isso é feito após o matched filter
-    indices_amostragem = np.arange(0, num_amostras, int(fs))
-    indices_amostragem = indices_amostragem[:num_simbolos]  # Garantir tamanho correto
-    
-    simbolos_i = componente_i[indices_amostragem]
-    simbolos_q = componente_q[indices_amostragem]
+    # As portadoras vêm do mesmo cache de add_carrier
+    # (um sinal recebido complexo, como o que sai do canal AWGN, mantém
+    # componentes complexas, como na multiplicação fora do lugar)
+    portadora_cos, portadora_sin = _portadoras(fc, t_start, num_simbolos, num_amostras, np.dtype(dtype))
+    
+    if filtrar:
+        # Filtrar passa-baixa para remover componentes de alta frequência
+        # (resultantes da multiplicação: 2fc, etc.) e decimar: uma média de
+        # sinal * portadora por símbolo (Q com o sinal negativo)
+        # Em sistemas reais, isso é feito com o matched filter
+        simbolos_i = _somas_por_simbolo(sinal, portadora_cos, passo, num_simbolos).astype(tipo_componentes, copy=False)
+        simbolos_q = _somas_por_simbolo(sinal, portadora_sin, passo, num_simbolos).astype(tipo_componentes, copy=False)
+        simbolos_i /= passo
+        simbolos_q /= -passo
+    else:
+        # Sem filtro: decimar primeiro e multiplicar só as amostras guardadas
+        # (uma amostra por símbolo)
+        amostras = sinal[..., :num_simbolos * passo:passo]
+        simbolos_i = np.multiply(amostras, portadora_cos[:num_simbolos * passo:passo], dtype=tipo_componentes)
+        simbolos_q = np.multiply(amostras, portadora_sin[:num_simbolos * passo:passo], dtype=tipo_componentes)
+        np.negative(simbolos_q, out=simbolos_q)  # Negativo para Q
     
     # Reconstruir símbolos complexos (ou reais para BPSK)
-    simbolos_demodulados = simbolos_i + 1j * simbolos_q
+    if np.iscomplexobj(simbolos_i):
+        # Componentes complexas (sinal recebido complexo): I + jQ completo
+        simbolos_demodulados = simbolos_i + 1j * simbolos_q
+    else:
+        # Componentes reais: escritas direto nas partes real e imaginária
+        simbolos_demodulados = np.empty(simbolos_i.shape, dtype=np.result_type(simbolos_i, np.complex64))
+        simbolos_demodulados.real = simbolos_i
+        simbolos_demodulados.imag = simbolos_q
 
     return simbolos_demodulados
 
 
-def bpsk_modulate(bits: NDArray[np.float64]) -> NDArray[np.complex128]:
+def bpsk_modulate(bits: NDArray[np.uint8], dtype: type = np.complex64) -> NDArray[np.complex64]:
     """
     Modula bits usando BPSK (Binary Phase Shift Keying).
     
@@ -206,15 +359,27 @@ def bpsk_modulate(bits: NDArray[np.float64]) -> NDArray[np.complex128]:
     - Baixa eficiência espectral (1 bit por símbolo)
     
     Parâmetros:
-        bits: array numpy com bits a modular (0 ou 1)
+        bits: array numpy com bits a modular (0 ou 1), de qualquer formato
+              (um lote de quadros é modulado de uma vez)
+        dtype: tipo dos símbolos (complex64 por padrão: ±1 é exato em
+               precisão simples; np.complex128 para precisão dupla;
+               np.float32/np.float64 para símbolos reais)
     
     Retorna:
         Array numpy com símbolos modulados (-1 ou +1)
     """
-    # Aplicar mapeamento BPSK:
-    # Bit 0 -> -1: 2*0 - 1 = -1
-    # Bit 1 -> +1: 2*1 - 1 = +1
-    simbolos_modulados = 2.0 * bits.astype(np.complex128) - 1.0
+    # Garantir que bits seja um array numpy de inteiros (sem cópia para uint8)
+    bits_entrada = np.asarray(bits, dtype=np.uint8)
+
+    # Validar valores (a tabela só tem entradas para 0 e 1)
+    if bits_entrada.size > 0 and bits_entrada.max() > 1:
+        raise ValueError("bits devem ser 0 ou 1")
+
+    # Aplicar mapeamento BPSK com uma consulta à tabela:
+    # Bit 0 -> -1
+    # Bit 1 -> +1
+    # (uma única passada, sem conversão de tipo nem contas no vetor inteiro)
+    simbolos_modulados = _CONSTELACAO_BPSK.astype(dtype, copy=False)[bits_entrada]
 
     return simbolos_modulados
 
@@ -224,29 +389,30 @@ def bpsk_demodulate(symbols: np.ndarray) -> np.ndarray:
     Demodula símbolos BPSK de volta para bits.
     
     Processo:
-    - Símbolo >= 0 (positivo ou zero) -> Bit 1
+    - Símbolo >= 0 (positivo ou zero, inclusive -0.0) -> Bit 1
     - Símbolo < 0 (negativo) -> Bit 0
     
-    Esta é uma decisão por limiar simples no zero.
+    Esta é uma decisão por limiar simples no zero, igual para qualquer tipo
+    de entrada (float32, float64, complexos, inteiros).
     
     Parâmetros:
-        symbols: array numpy com símbolos modulados (valores reais)
+        symbols: array numpy com símbolos modulados (reais ou complexos;
+                 só a parte real é usada)
     
     Retorna:
         Array numpy com bits demodulados (0 ou 1)
     """
     # Garantir que symbols seja um array numpy
-    simbolos_entrada = np.asarray(symbols, dtype=np.float64)
+    simbolos_entrada = np.asarray(symbols)
     
-    # Decisão por limiar:
-    # Se símbolo >= 0: decidir por bit 1
-    # Se símbolo < 0: decidir por bit 0
-    bits_demodulados = (simbolos_entrada >= 0).astype(np.uint8)
+    # Decisão por limiar na parte real (view, sem copiar nem converter para
+    # float64); o resultado booleano é lido como uint8 sem cópia
+    bits_demodulados = np.greater_equal(np.real(simbolos_entrada), 0).view(np.uint8)
 
     return bits_demodulados
 
 
-def qpsk_modulate(bits: np.ndarray) -> Tuple[np.ndarray, int]:
+def qpsk_modulate(bits: np.ndarray, dtype: type = np.complex64) -> Tuple[np.ndarray, int]:
     """
     Modula bits usando QPSK (Quadrature Phase Shift Keying) com mapeamento Gray.
     
@@ -262,7 +428,10 @@ def qpsk_modulate(bits: np.ndarray) -> Tuple[np.ndarray, int]:
     Normalização: divide por sqrt(2) para ter potência média = 1
     
     Parâmetros:
-        bits: array numpy com bits a modular (0 ou 1)
+        bits: array numpy com bits a modular (0 ou 1), no último eixo (eixos
+              anteriores são quadros independentes)
+        dtype: tipo dos símbolos (complex64 por padrão; np.complex128 para
+               precisão dupla)
     
     Retorna:
         (símbolos_modulados, padding_bits)
@@ -272,48 +441,38 @@ def qpsk_modulate(bits: np.ndarray) -> Tuple[np.ndarray, int]:
     # Garantir que bits seja um array numpy
     bits_entrada = np.asarray(bits, dtype=np.uint8)
     
-    # Validar formato
-    if bits_entrada.ndim != 1:
-        raise ValueError("bits deve ser um vetor 1D")
+    # Validar formato (eixos antes do último são quadros independentes)
+    if bits_entrada.ndim < 1:
+        raise ValueError("bits deve ter ao menos 1 dimensão")
 
     # QPSK precisa de número par de bits (2 bits por símbolo)
     # Se número ímpar, adicionar um bit zero no final (padding)
-    numero_bits_originais = len(bits_entrada)
+    numero_bits_originais = bits_entrada.shape[-1]
     padding_bits = 0
     
     if numero_bits_originais % 2 != 0:
-        # Adicionar um bit zero no final
-        bits_entrada = np.concatenate([bits_entrada, np.zeros(1, dtype=np.uint8)])
+        # Adicionar um bit zero no final (de cada quadro)
+        bits_entrada = np.concatenate([bits_entrada, np.zeros(bits_entrada.shape[:-1] + (1,), dtype=np.uint8)], axis=-1)
         padding_bits = 1
 
+    # Validar valores (a tabela só tem entradas para pares de 0/1)
+    # (max() não cria vetor booleano temporário como np.any(bits > 1))
+    if bits_entrada.size > 0 and bits_entrada.max() > 1:
+        raise ValueError("bits devem ser 0 ou 1")
+
     # Agrupar bits em pares (cada par vira um símbolo QPSK)
-    pares_de_bits = bits_entrada.reshape(-1, 2)
-    numero_simbolos = len(pares_de_bits)
-    
-    # Criar array para símbolos modulados (complexos)
-    simbolos_modulados = np.empty(numero_simbolos, dtype=np.complex128)
-
-    # Mapear cada par de bits para um símbolo QPSK (mapeamento Gray)
-    for indice, (bit0, bit1) in enumerate(pares_de_bits):
-        if bit0 == 0 and bit1 == 0:
-            # (0,0) -> fase 45° (quadrante I)
-            simbolos_modulados[indice] = 1 + 1j
-        elif bit0 == 0 and bit1 == 1:
-            # (0,1) -> fase 135° (quadrante II)
-            simbolos_modulados[indice] = -1 + 1j
-        elif bit0 == 1 and bit1 == 1:
-            # (1,1) -> fase 225° (quadrante III)
-            simbolos_modulados[indice] = -1 - 1j
-        elif bit0 == 1 and bit1 == 0:
-            # (1,0) -> fase 315° (quadrante IV)
-            simbolos_modulados[indice] = 1 - 1j
-        else:
-            raise ValueError("bits devem ser 0 ou 1")
+    pares_de_bits = bits_entrada.reshape(bits_entrada.shape[:-1] + (-1, 2))
+    
+    # Ler cada par como um número de 0 a 3: índice = 2*bit0 + bit1
+    # (o OR é feito no próprio vetor de índices, sem outro temporário)
+    indices_constelacao = pares_de_bits[..., 0] << 1
+    indices_constelacao |= pares_de_bits[..., 1]
 
-    # Normalizar potência média para 1
-    # Cada símbolo tem magnitude sqrt(2), então dividir por sqrt(2) normaliza
-    fator_normalizacao = np.sqrt(2.0)
-    simbolos_modulados /= fator_normalizacao
+    # Mapear cada par de bits para um símbolo QPSK (mapeamento Gray) com uma
+    # consulta à tabela, que já está normalizada para potência média 1
+    # (cada ponto ±1±1j tem magnitude sqrt(2) e foi dividido por sqrt(2))
+    # (a tabela de 4 pontos é convertida para o tipo pedido antes da consulta)
+    simbolos_modulados = _CONSTELACAO_QPSK.astype(dtype, copy=False)[indices_constelacao]
 
     return simbolos_modulados, padding_bits
 
@@ -323,9 +482,9 @@ def qpsk_demodulate(symbols: np.ndarray, padding: int = 0) -> np.ndarray:
     Demodula símbolos QPSK de volta para bits.
     
     Processo:
-    1. Desnormaliza símbolos (multiplica por sqrt(2))
-    2. Para cada símbolo, verifica sinal da parte real e imaginária
-    3. Mapeia quadrante para par de bits (inverso do mapeamento Gray)
+    1. Para cada símbolo, verifica sinal da parte real e imaginária
+       (a normalização por sqrt(2) não muda o sinal, então não é desfeita)
+    2. Mapeia quadrante para par de bits (inverso do mapeamento Gray)
     
     Decisão por quadrante:
     - Quadrante I (Re>=0, Im>=0)   -> (0,0)
@@ -333,48 +492,36 @@ def qpsk_demodulate(symbols: np.ndarray, padding: int = 0) -> np.ndarray:
     - Quadrante III (Re<0, Im<0)    -> (1,1)
     - Quadrante IV (Re>=0, Im<0)    -> (1,0)
     
+    Ou seja: primeiro bit = (Im < 0) e segundo bit = (Re < 0); zero (+0.0
+    ou -0.0) conta como não negativo, qualquer que seja o tipo da entrada.
+    
+    Aceita também um lote de sinais (formato (..., N)): cada linha é
+    demodulada de forma independente.
+    
     Parâmetros:
         symbols: array numpy com símbolos modulados (valores complexos)
         padding: número de bits de preenchimento a remover (0 ou 1)
     
     Retorna:
-        Array numpy com bits demodulados (0 ou 1)
+        Array numpy com bits demodulados (0 ou 1), formato (..., 2N - padding)
     """
     # Garantir que symbols seja um array numpy
-    simbolos_entrada = np.asarray(symbols, dtype=np.complex128)
-    
-    # Desnormalizar símbolos (reverter divisão por sqrt(2))
-    fator_normalizacao = np.sqrt(2.0)
-    simbolos_desnormalizados = simbolos_entrada * fator_normalizacao
-
-    # Lista para armazenar bits demodulados
-    bits_demodulados = []
-    
-    # Para cada símbolo, decidir qual par de bits foi transmitido
-    for simbolo in simbolos_desnormalizados:
-        # Extrair parte real e imaginária
-        parte_real = simbolo.real
-        parte_imag = simbolo.imag
-        
-        # Decisão por quadrante (inverso do mapeamento Gray)
-        if parte_real >= 0 and parte_imag >= 0:
-            # Quadrante I -> (0,0)
-            bits_demodulados.extend([0, 0])
-        elif parte_real < 0 and parte_imag >= 0:
-            # Quadrante II -> (0,1)
-            bits_demodulados.extend([0, 1])
-        elif parte_real < 0 and parte_imag < 0:
-            # Quadrante III -> (1,1)
-            bits_demodulados.extend([1, 1])
-        else:  # parte_real >= 0 and parte_imag < 0
-            # Quadrante IV -> (1,0)
-            bits_demodulados.extend([1, 0])
+    simbolos_entrada = np.asarray(symbols)
+
+    # Um par de bits por símbolo, decidido pelo sinal de Im e Re
+    # (inverso do mapeamento Gray, sem laço em Python). As comparações leem
+    # Re e Im como views (sem converter para complex128) e escrevem direto
+    # no buffer de pares, que é lido como uint8 sem cópia
+    pares_de_bits = np.empty(simbolos_entrada.shape + (2,), dtype=np.bool_)
+    np.less(simbolos_entrada.imag, 0, out=pares_de_bits[..., 0])
+    np.less(simbolos_entrada.real, 0, out=pares_de_bits[..., 1])
+    pares_de_bits = pares_de_bits.view(np.uint8)
+
+    # Juntar os pares em sequência: (..., N, 2) -> (..., 2N)
+    bits_array = pares_de_bits.reshape(simbolos_entrada.shape[:-1] + (-1,))
 
     # Remover bits de preenchimento se foram adicionados durante modulação
     if padding > 0:
-        bits_demodulados = bits_demodulados[:-padding]
-
-    # Converter lista para array numpy
-    bits_array = np.array(bits_demodulados, dtype=np.uint8)
+        bits_array = bits_array[..., :-padding]
 
     return bits_array
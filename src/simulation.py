@@ -1,11 +1,12 @@
-
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Callable, Tuple
+import math
+import multiprocessing
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from numpy.typing import NDArray
 
-from .encoding import text_to_bits, bits_to_text, manchester_encode, manchester_decode
+from .encoding import text_to_bits, manchester_encode, manchester_decode
 from .modulation import (
     bpsk_modulate,
     bpsk_demodulate,
@@ -16,6 +17,41 @@ from .modulation import (
 )
 from .channel import add_awgn
 
+# Mensagens de depuração dentro do laço de simulação (ex.: BER de cada SNR)
+# só são geradas quando a variável de ambiente SIM_DEBUG=1 está definida
+_DEBUG = os.environ.get("SIM_DEBUG") == "1"
+
+# Limite de amostras do sinal recebido simuladas de uma vez (todos os SNRs de
+# um bloco x todas as iterações x amostras): 2**22 amostras complex64 = 32 MB
+_MAX_AMOSTRAS_POR_BLOCO = 2 ** 22
+
+# Precisão de ponto flutuante do ruído sorteado (np.float32 ou np.float64)
+# O ruído complexo usa o tipo complexo correspondente, e o sinal com ruído
+# fica na maior precisão entre ruído e símbolos (complex64): float32 basta
+# para a decisão por sinal e gasta metade da memória; np.float64 permite
+# conferir as curvas de BER em precisão dupla
+_PRECISAO = np.float32
+_PRECISAO_COMPLEXA = np.promote_types(_PRECISAO, np.complex64)
+
+# Fator de 2 em dB (10*log10(2) ≈ 3.01 dB): diferença entre Eb/N0 e Es/N0
+# quando cada símbolo carrega metade ou o dobro de um bit de informação
+_LOG10_2_DB = 10.0 * math.log10(2.0)
+
+# Contagem de bits 1 de cada byte (0 a 255): usada no lugar de np.bitwise_count
+# em versões do NumPy anteriores à 2.0
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.uint8)
+
+
+@lru_cache(maxsize=32)
+def _bits_da_mensagem(message: str) -> bytes:
+    """
+    Bits da mensagem (text_to_bits) guardados em cache, como bytes imutáveis.
+    
+    Chamadas repetidas de run_full_simulation com a mesma mensagem (ex.: um
+    laço que varia só os SNRs) não convertem o texto de novo.
+    """
+    return text_to_bits(message).tobytes()
+
 
 def bit_error_rate(original: np.ndarray, received: np.ndarray) -> Tuple[float, int, int]:
     """
@@ -26,24 +62,42 @@ def bit_error_rate(original: np.ndarray, received: np.ndarray) -> Tuple[float, i
     2. Compara bit a bit para encontrar erros
     3. Calcula BER = número de erros / total de bits
     
+    A comparação é feita no último eixo: received pode ter eixos anteriores
+    (ex.: um quadro recebido por SNR e por iteração), e então BER e número de
+    erros saem como arrays com esses eixos, todos comparados com original.
+    
     Retorna:
         (BER, número_de_erros, total_de_bits)
     """
     # Garantir que ambos os vetores tenham o mesmo tamanho
-    tamanho_original = len(original)
-    tamanho_recebido = len(received)
+    tamanho_original = np.shape(original)[-1]
+    tamanho_recebido = np.shape(received)[-1]
     tamanho_comparacao = min(tamanho_original, tamanho_recebido)
     
     if tamanho_comparacao == 0:
         return (0.0, 0, 0)
     
     # Converter para o mesmo tipo para comparação
-    bits_originais = original[:tamanho_comparacao].astype(np.uint8)
-    bits_recebidos = received[:tamanho_comparacao].astype(np.uint8)
+    # (np.asarray não copia quando os bits já são uint8, o caso comum)
+    bits_originais = np.asarray(original, dtype=np.uint8)[..., :tamanho_comparacao]
+    bits_recebidos = np.asarray(received, dtype=np.uint8)[..., :tamanho_comparacao]
 
-    # Comparar bit a bit: True onde há diferença (erro)
-    bits_com_erro = (bits_originais != bits_recebidos)
-    numero_de_erros = np.sum(bits_com_erro)
+    # Comparar bit a bit com os bits empacotados (8 por byte): o XOR dos bytes
+    # tem um bit 1 em cada posição com erro, e a contagem de bits 1 (popcount)
+    # dá o número de erros movendo 8 vezes menos memória que byte a byte
+    # (os dois lados são completados com os mesmos zeros: não geram erros)
+    # (com quadros em lote, os bits originais valem para todos por broadcasting)
+    # np.packbits é bem mais lento em entradas com passo (ex.: a view de
+    # manchester_decode): copiar para um bloco contíguo antes de empacotar
+    # sai mais barato (sem cópia quando os bits já são contíguos)
+    bits_originais = np.ascontiguousarray(bits_originais)
+    bits_recebidos = np.ascontiguousarray(bits_recebidos)
+    bytes_com_erro = np.bitwise_xor(np.packbits(bits_originais, axis=-1), np.packbits(bits_recebidos, axis=-1))
+    if hasattr(np, "bitwise_count"):
+        erros_por_byte = np.bitwise_count(bytes_com_erro)
+    else:
+        erros_por_byte = _BITS_POR_BYTE[bytes_com_erro]
+    numero_de_erros = erros_por_byte.sum(axis=-1, dtype=np.int64)
     
     # Calcular BER: proporção de bits errados
     ber = numero_de_erros / float(tamanho_comparacao)
@@ -51,7 +105,263 @@ def bit_error_rate(original: np.ndarray, received: np.ndarray) -> Tuple[float, i
     return (ber, numero_de_erros, tamanho_comparacao)
 
 
-def simulate_ber_bpsk(bits: NDArray[np.float64], snr_db_values: NDArray[np.float64], ruido: NDArray[np.complex128], use_manchester: bool = True, use_carrier: bool = False, fc: float = 1.0, fs: float = 10.0) -> NDArray[np.float64]:
+def _modular_bpsk(bits: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    bpsk_modulate com a mesma interface de qpsk_modulate: (símbolos, padding).
+    
+    BPSK usa 1 bit por símbolo, então nunca há bits de preenchimento.
+    """
+    return bpsk_modulate(bits), 0
+
+
+def _demodular_bpsk(symbols: np.ndarray, padding: int = 0) -> np.ndarray:
+    """
+    bpsk_demodulate com a mesma interface de qpsk_demodulate (padding é sempre 0).
+    """
+    return bpsk_demodulate(symbols)
+
+
+def _modulacao_bpsk(use_manchester: bool, use_carrier: bool) -> Tuple[Callable, Callable, float, str, bool]:
+    """
+    Parâmetros de _simulate_ber para BPSK: (modular, demodular,
+    ajuste_es_n0_db, nome, somente_real).
+    """
+    # Conversão de Eb/N0 para Es/N0
+    # Com Manchester: cada bit de informação vira 2 símbolos BPSK
+    # Portanto: Es = Eb/2, então Es/N0 = Eb/N0 - 10*log10(2) ≈ Eb/N0 - 3 dB
+    # Sem Manchester: cada bit vira 1 símbolo, então Es/N0 = Eb/N0
+    ajuste_es_n0_db = -_LOG10_2_DB if use_manchester else 0.0
+    # Em banda base, a decisão BPSK usa só a parte real: o canal é simulado
+    # só com ela (com portadora, a remoção da portadora usa o sinal completo)
+    return _modular_bpsk, _demodular_bpsk, ajuste_es_n0_db, "BPSK", not use_carrier
+
+
+def _modulacao_qpsk(use_manchester: bool) -> Tuple[Callable, Callable, float, str, bool]:
+    """
+    Parâmetros de _simulate_ber para QPSK: (modular, demodular,
+    ajuste_es_n0_db, nome, somente_real).
+    """
+    # Conversão de Eb/N0 para Es/N0
+    # Com Manchester: cada bit de informação vira 2 bits, que vira 1 símbolo QPSK
+    # Portanto: 1 bit info = 1 símbolo QPSK, então Es/N0 = Eb/N0
+    # Sem Manchester: 2 bits de informação vira 1 símbolo QPSK
+    # Portanto: Es = 2*Eb, então Es/N0 = Eb/N0 + 10*log10(2) ≈ Eb/N0 + 3 dB
+    ajuste_es_n0_db = 0.0 if use_manchester else _LOG10_2_DB
+    return qpsk_modulate, qpsk_demodulate, ajuste_es_n0_db, "QPSK", False
+
+
+def _ber_por_snr(sinal_transmitido: np.ndarray, ruido: NDArray[np.complex64], snrs_es_n0_db: NDArray[np.float64], bits: np.ndarray, demodular: Callable[[np.ndarray, int], np.ndarray], padding_bits: int, use_manchester: bool, use_carrier: bool, fc: float, fs: float, sinal_com_ruido: NDArray[np.complex64] | None = None) -> NDArray[np.float64]:
+    """
+    Executa os passos 4 a 7 da simulação para um bloco de valores de SNR.
+    
+    Todos os SNRs do bloco e todas as realizações de ruído são simulados de
+    uma vez, como um único tensor (SNR, iterações, amostras), sem laços em
+    Python. Fica no nível do módulo para poder ser enviada a processos de um
+    multiprocessing.Pool (cada SNR é independente dos demais).
+    
+    Parâmetros:
+        sinal_transmitido: sinal já modulado (e com portadora, se usada)
+        ruido: ruído normalizado, formato (N,) ou (iterações, N)
+        snrs_es_n0_db: vetor com os SNRs do bloco em dB por símbolo (Es/N0)
+        bits: bits de informação originais
+        demodular: demodulador, chamado como demodular(símbolos, padding_bits)
+        padding_bits: bits de preenchimento adicionados na modulação
+        use_manchester, use_carrier, fc, fs: como em _simulate_ber
+        sinal_com_ruido: buffer opcional para o sinal recebido (None = aloca)
+    
+    Retorna:
+        Array de BER com formato (len(snrs_es_n0_db),) + ruido.shape[:-1]
+    """
+    # PASSO 4: Simular canal com ruído AWGN
+    # Adiciona ruído gaussiano branco ao sinal transmitido, em todos os SNRs
+    # do bloco e em todas as realizações de ruído do lote de uma só vez
+    sinal_recebido = add_awgn(sinal_transmitido, snrs_es_n0_db, ruido, saida=sinal_com_ruido)
+    
+    # PASSOS 4.5 a 7: todos os quadros recebidos de uma vez (cada função
+    # trabalha no último eixo; os eixos de SNR e de iteração são lotes)
+
+    # PASSO 4.5: Remover portadora (se foi adicionada)
+    # Em sistemas reais, requer sincronização precisa (PLL - Phase Locked Loop)
+    # Aplica filtro passa-baixa para remover componentes de alta frequência
+    if use_carrier:
+        simbolos_recebidos = remove_carrier(sinal_recebido, fc, fs, use_filtering=True)
+    else:
+        simbolos_recebidos = sinal_recebido
+
+    # PASSO 5: Demodulação
+    # Converte símbolos recebidos de volta para bits
+    # Remove padding se foi adicionado durante modulação
+    bits_demodulados = demodular(simbolos_recebidos, padding_bits)
+
+    # PASSO 6: Decodificação (se Manchester foi usado)
+    if use_manchester:
+        # Remove codificação Manchester para recuperar bits originais
+        bits_recebidos = manchester_decode(bits_demodulados)
+    else:
+        bits_recebidos = bits_demodulados
+
+    # PASSO 7: Calcular BER comparando bits recebidos com bits originais
+    resultados_ber, numero_erros, total_bits = bit_error_rate(bits, bits_recebidos)
+
+    return resultados_ber
+
+
+def _mostrar_bers(nome: str, snr_db_values: NDArray[np.float64], resultados_ber: NDArray[np.float64]) -> None:
+    """
+    Mostra o BER médio de cada SNR (mensagens de verbose das simulações).
+    """
+    for i, snr_eb_n0_db in enumerate(snr_db_values):
+        print(f"{nome} | SNR {snr_eb_n0_db:.1f} dB | BER média: {np.mean(resultados_ber[i]):.6f}")
+
+
+def _preparar_simulacao(bits: np.ndarray, snr_db_values: NDArray[np.float64], modular: Callable[[np.ndarray], Tuple[np.ndarray, int]], ajuste_es_n0_db: float, ruido: NDArray[np.complex64] | None, use_manchester: bool, use_carrier: bool, fc: float, fs: float, rng: np.random.Generator | None, bits_manchester: np.ndarray | None, somente_real: bool = False) -> Tuple[np.ndarray, NDArray[np.complex64], NDArray[np.float64], int]:
+    """
+    Passos 1 a 3 de _simulate_ber: o que não depende do SNR nem do ruído.
+    
+    Retorna:
+        (sinal_transmitido, ruido, snrs_es_n0_db, padding_bits), com o ruído
+        já sorteado (se ruido é None) e reduzido à parte real (somente_real)
+    """
+    # PASSO 1: Preparar bits para transmissão
+    # (os bits de entrada nunca são modificados: não é preciso copiá-los)
+    bits_para_transmitir = bits
+    
+    # Aplicar codificação Manchester se solicitado (ou usar a codificação já
+    # feita pelo chamador, compartilhada entre simulações dos mesmos bits)
+    if use_manchester:
+        if bits_manchester is None:
+            bits_manchester = manchester_encode(bits)
+        bits_para_transmitir = bits_manchester
+
+    # PASSO 2: Modulação
+    # Feita uma única vez: o sinal transmitido não depende do SNR nem do ruído
+    # Retorna também informação sobre padding se necessário
+    simbolos_banda_base, padding_bits = modular(bits_para_transmitir)
+    
+    # PASSO 2.5: Adicionar portadora (opcional)
+    # Em sistemas reais: fc >> taxa_de_símbolos (portadora muito maior)
+    # Aplica pulse shaping para tornar mais realista
+    if use_carrier:
+        sinal_transmitido = add_carrier(simbolos_banda_base, fc, fs, use_pulse_shaping=True)
+    else:
+        sinal_transmitido = simbolos_banda_base
+
+    # Sem ruído do chamador: sortear uma realização com o gerador recebido
+    # (ou um novo, não reprodutível), do tamanho do sinal transmitido
+    if ruido is None:
+        if rng is None:
+            rng = np.random.default_rng()
+        ruido = rng.standard_normal(2 * sinal_transmitido.shape[-1], dtype=_PRECISAO).view(_PRECISAO_COMPLEXA)
+
+    # Decisão só pela parte real (BPSK em banda base): a parte imaginária do
+    # sinal é zero e a do ruído não afeta a decisão, então o canal é simulado
+    # só com as partes reais (views, sem cópia): o sinal recebido fica real,
+    # com metade da memória, e a demodulação lê metade dos bytes
+    if somente_real:
+        sinal_transmitido = sinal_transmitido.real
+        ruido = ruido.real
+
+    # PASSO 3: Conversão de Eb/N0 para Es/N0 (para todos os SNRs)
+    # O ajuste depende da modulação e do Manchester (ver simulate_ber_*)
+    snrs_es_n0_db = np.asarray(snr_db_values, dtype=np.float64) + ajuste_es_n0_db
+
+    return sinal_transmitido, ruido, snrs_es_n0_db, padding_bits
+
+
+def _tarefas_paralelas(sinal_transmitido: np.ndarray, ruido: NDArray[np.complex64], snrs_es_n0_db: NDArray[np.float64], bits: np.ndarray, demodular: Callable[[np.ndarray, int], np.ndarray], padding_bits: int, use_manchester: bool, use_carrier: bool, fc: float, fs: float, processos: int) -> Tuple[list, list]:
+    """
+    Divide os passos 4 a 7 em tarefas independentes para um multiprocessing.Pool.
+    
+    Cada tarefa simula um SNR para uma faixa de iterações (com seu próprio
+    buffer de sinal recebido, de até _MAX_AMOSTRAS_POR_BLOCO amostras). As
+    realizações de ruído também são independentes: com menos SNRs que
+    processos, as iterações de cada SNR são divididas em faixas para ocupar
+    todos eles, e cada tarefa recebe só as linhas do ruído que usa.
+    
+    Retorna:
+        (destinos, argumentos): argumentos[k] são os argumentos de
+        _ber_por_snr da tarefa k, e destinos[k] o índice, na matriz de
+        resultados (SNR, iterações), onde vai o BER que ela calcula
+    """
+    formato_lote = ruido.shape[:-1]
+    num_iteracoes = formato_lote[0] if formato_lote else 1
+    # Como no caminho serial, cada tarefa simula no máximo
+    # _MAX_AMOSTRAS_POR_BLOCO amostras: com mensagens longas (ou mais SNRs
+    # que processos), as iterações são divididas em mais faixas, e a memória
+    # de cada tarefa (e a cópia do ruído enviada a ela) fica limitada
+    amostras_por_iteracao = max(1, int(np.prod(formato_lote[1:])) * sinal_transmitido.size)
+    iteracoes_por_tarefa = max(1, _MAX_AMOSTRAS_POR_BLOCO // amostras_por_iteracao)
+    faixas_por_snr = min(num_iteracoes, max(-(-num_iteracoes // iteracoes_por_tarefa), -(-processos // len(snrs_es_n0_db))))
+    limites = [num_iteracoes * k // faixas_por_snr for k in range(faixas_por_snr + 1)]
+    faixas = [slice(inicio, fim) for inicio, fim in zip(limites[:-1], limites[1:])]
+    destinos = []
+    argumentos = []
+    for i in range(len(snrs_es_n0_db)):
+        for faixa in faixas:
+            destinos.append((i, faixa) if formato_lote else (i,))
+            argumentos.append((sinal_transmitido, ruido[faixa] if formato_lote else ruido, snrs_es_n0_db[i:i + 1], bits, demodular, padding_bits, use_manchester, use_carrier, fc, fs))
+    return destinos, argumentos
+
+
+def _simulate_ber(bits: np.ndarray, snr_db_values: NDArray[np.float64], modular: Callable[[np.ndarray], Tuple[np.ndarray, int]], demodular: Callable[[np.ndarray, int], np.ndarray], ajuste_es_n0_db: float, nome: str, ruido: NDArray[np.complex64] | None, use_manchester: bool, use_carrier: bool, fc: float, fs: float, processos: int, verbose: bool, rng: np.random.Generator | None, bits_manchester: np.ndarray | None, somente_real: bool = False) -> NDArray[np.float64]:
+    """
+    Corpo comum de simulate_ber_bpsk e simulate_ber_qpsk.
+    
+    A modulação entra pelas funções modular (bits -> (símbolos, padding)) e
+    demodular ((símbolos, padding) -> bits), e a conversão de Eb/N0 para
+    Es/N0 pelo ajuste em dB somado a cada SNR. nome identifica a modulação
+    nas mensagens de verbose. Com somente_real, só a parte real do sinal
+    e do ruído é simulada (para modulações decididas só pela parte real).
+    Os demais parâmetros e o retorno são os de simulate_ber_bpsk.
+    """
+    sinal_transmitido, ruido, snrs_es_n0_db, padding_bits = _preparar_simulacao(
+        bits, snr_db_values, modular, ajuste_es_n0_db, ruido, use_manchester, use_carrier, fc, fs, rng, bits_manchester, somente_real)
+
+    # Resultados de BER: um por SNR e por realização de ruído do lote
+    formato_lote = ruido.shape[:-1]
+    resultados_ber = np.empty((len(snr_db_values),) + formato_lote, np.float64)
+
+    # PASSOS 4 a 7 para blocos de valores de SNR (independentes entre si)
+    num_iteracoes = formato_lote[0] if formato_lote else 1
+    if processos > 1 and len(snrs_es_n0_db) * num_iteracoes > 1:
+        # Em paralelo: uma tarefa por SNR e faixa de iterações
+        destinos, argumentos = _tarefas_paralelas(sinal_transmitido, ruido, snrs_es_n0_db, bits, demodular, padding_bits, use_manchester, use_carrier, fc, fs, processos)
+        with multiprocessing.Pool(processes=min(processos, len(argumentos))) as pool:
+            bers_por_tarefa = pool.starmap(_ber_por_snr, argumentos)
+        for destino, bers_tarefa in zip(destinos, bers_por_tarefa):
+            resultados_ber[destino] = bers_tarefa[0]
+    else:
+        # No processo atual: blocos de (SNRs x iterações), cada um simulado
+        # como um único tensor de até _MAX_AMOSTRAS_POR_BLOCO amostras; um
+        # único buffer de sinal recebido é reaproveitado por add_awgn em todos
+        # os blocos. Vários SNRs por bloco quando todas as iterações de um SNR
+        # cabem no limite; senão, um SNR por bloco e as iterações em faixas
+        # (a memória fica limitada mesmo com mensagens longas)
+        amostras_por_iteracao = max(1, int(np.prod(formato_lote[1:])) * sinal_transmitido.size)
+        iteracoes_por_bloco = max(1, min(num_iteracoes, _MAX_AMOSTRAS_POR_BLOCO // amostras_por_iteracao))
+        amostras_por_snr = iteracoes_por_bloco * amostras_por_iteracao
+        snrs_por_bloco = max(1, min(len(snrs_es_n0_db), _MAX_AMOSTRAS_POR_BLOCO // amostras_por_snr))
+        formato_bloco = ((iteracoes_por_bloco,) + formato_lote[1:]) if formato_lote else ()
+        # (no tipo do sinal e do ruído: complex64 com os padrões, ou float32
+        # com somente_real)
+        sinal_com_ruido = np.empty((snrs_por_bloco,) + formato_bloco + sinal_transmitido.shape, dtype=np.result_type(sinal_transmitido, ruido, np.float32))
+        for inicio in range(0, len(snrs_es_n0_db), snrs_por_bloco):
+            bloco = snrs_es_n0_db[inicio:inicio + snrs_por_bloco]
+            if not formato_lote:
+                resultados_ber[inicio:inicio + len(bloco)] = _ber_por_snr(sinal_transmitido, ruido, bloco, bits, demodular, padding_bits, use_manchester, use_carrier, fc, fs, sinal_com_ruido[:len(bloco)])
+                continue
+            for inicio_iteracao in range(0, num_iteracoes, iteracoes_por_bloco):
+                faixa = slice(inicio_iteracao, inicio_iteracao + iteracoes_por_bloco)
+                ruido_faixa = ruido[faixa]
+                resultados_ber[inicio:inicio + len(bloco), faixa] = _ber_por_snr(sinal_transmitido, ruido_faixa, bloco, bits, demodular, padding_bits, use_manchester, use_carrier, fc, fs, sinal_com_ruido[:len(bloco), :len(ruido_faixa)])
+
+    if verbose:
+        _mostrar_bers(nome, snr_db_values, resultados_ber)
+    
+    return resultados_ber
+
+
+def simulate_ber_bpsk(bits: NDArray[np.float64], snr_db_values: NDArray[np.float64], ruido: NDArray[np.complex64] | None = None, use_manchester: bool = True, use_carrier: bool = False, fc: float = 1.0, fs: float = 10.0, processos: int = 1, verbose: bool = _DEBUG, rng: np.random.Generator | None = None, bits_manchester: np.ndarray | None = None) -> NDArray[np.float64]:
     """
     Simula a Taxa de Erro de Bits (BER) para modulação BPSK.
     
@@ -69,87 +379,33 @@ def simulate_ber_bpsk(bits: NDArray[np.float64], snr_db_values: NDArray[np.float
     Parâmetros:
         bits: bits de informação originais
         snr_db_values: lista de valores de SNR em dB (Eb/N0)
+        ruido: ruído gaussiano complexo normalizado; formato (N,) para uma
+               realização ou (iterações, N) para simular todas de uma vez
+               (None = sorteia uma realização com rng)
         use_manchester: se True, aplica codificação Manchester
         use_carrier: se True, adiciona portadora (modulação passa-banda)
         fc: frequência da portadora em Hz (padrão: 1.0)
         fs: taxa de amostragem (amostras por símbolo) (padrão: 10.0)
+        processos: número de processos para simular os valores de SNR (e
+                   as iterações de cada um) em paralelo (1 = tudo no
+                   processo atual)
+        verbose: se True, mostra o BER médio de cada SNR (padrão: SIM_DEBUG=1)
+        rng: gerador usado para sortear o ruído quando ruido é None
+             (None = np.random.default_rng() sem semente)
+        bits_manchester: manchester_encode(bits) já calculado, usado com
+                         use_manchester (None = codifica aqui)
     
     Retorna:
-        Lista de valores de BER para cada SNR
+        Array de BER com formato (len(snr_db_values),) + ruido.shape[:-1]:
+        um valor por SNR e por realização de ruído
     """
-    # PASSO 1: Preparar bits para transmissão
-    bits_para_transmitir = bits.copy()
-    
-    # Aplicar codificação Manchester se solicitado
-    if use_manchester:
-        bits_para_transmitir = manchester_encode(bits_para_transmitir)
-
-    # Lista para armazenar resultados de BER
-    resultados_ber = np.ndarray(bits.shape, np.float64)
-    
-    # Para cada valor de SNR, realizar simulação
-    for i, snr_eb_n0_db in enumerate(snr_db_values):
-        # PASSO 2: Modulação BPSK
-        # Converte bits (0/1) em símbolos (-1/+1)
-        simbolos_banda_base = bpsk_modulate(bits_para_transmitir)
-        
-        # PASSO 2.5: Adicionar portadora (opcional)
-        # Em sistemas reais: fc >> taxa_de_símbolos (portadora muito maior)
-        # Aplica pulse shaping para tornar mais realista
-        if use_carrier:
-            sinal_transmitido = add_carrier(simbolos_banda_base, fc, fs, use_pulse_shaping=True)
-        else:
-            sinal_transmitido = simbolos_banda_base
-        
-        # PASSO 3: Conversão de Eb/N0 para Es/N0
-        # Eb/N0 = energia por bit de informação
-        # Es/N0 = energia por símbolo modulado
-        # 
-        # Com Manchester: cada bit de informação vira 2 símbolos BPSK
-        # Portanto: Es = Eb/2, então Es/N0 = Eb/N0 - 10*log10(2) ≈ Eb/N0 - 3 dB
-        #
-        # Sem Manchester: cada bit vira 1 símbolo, então Es/N0 = Eb/N0
-        if use_manchester:
-            # Cada bit de informação vira 2 símbolos, então a energia por símbolo é menor
-            fator_manchester_db = 10 * np.log10(2)  # ≈ 3.01 dB
-            snr_es_n0_db = snr_eb_n0_db - fator_manchester_db
-        else:
-            # Sem Manchester: 1 bit = 1 símbolo, sem ajuste necessário
-            snr_es_n0_db = snr_eb_n0_db
-
-        # PASSO 4: Simular canal com ruído AWGN
-        # Adiciona ruído gaussiano branco ao sinal transmitido
-        sinal_com_ruido = add_awgn(sinal_transmitido, snr_es_n0_db, ruido)
-        
-        # PASSO 4.5: Remover portadora (se foi adicionada)
-        # Em sistemas reais, requer sincronização precisa (PLL - Phase Locked Loop)
-        # Aplica filtro passa-baixa para remover componentes de alta frequência
-        if use_carrier:
-            simbolos_recebidos = remove_carrier(sinal_com_ruido, fc, fs, use_filtering=True)
-        else:
-            simbolos_recebidos = sinal_com_ruido
-        
-        # PASSO 5: Demodulação BPSK
-        # Converte símbolos recebidos de volta para bits
-        # Decisão: símbolo >= 0 -> bit 1, símbolo < 0 -> bit 0
-        # Para BPSK, usar apenas parte real se for complexo (após remoção de portadora)
-        bits_demodulados = bpsk_demodulate(simbolos_recebidos)
-        
-        # PASSO 6: Decodificação (se Manchester foi usado)
-        if use_manchester:
-            # Remove codificação Manchester para recuperar bits originais
-            bits_recebidos = manchester_decode(bits_demodulados)
-        else:
-            bits_recebidos = bits_demodulados
-        
-        # PASSO 7: Calcular BER comparando bits recebidos com bits originais
-        ber, numero_erros, total_bits = bit_error_rate(bits, bits_recebidos)
-        resultados_ber[i] = ber
-    
-    return resultados_ber
+    modular, demodular, ajuste_es_n0_db, nome, somente_real = _modulacao_bpsk(use_manchester, use_carrier)
+    return _simulate_ber(bits, snr_db_values, modular, demodular, ajuste_es_n0_db, nome,
+                         ruido, use_manchester, use_carrier, fc, fs, processos, verbose, rng, bits_manchester,
+                         somente_real=somente_real)
 
 
-def simulate_ber_qpsk(bits: NDArray[np.float64], snr_db_values: NDArray[np.float64], ruido: NDArray[np.complex128], use_manchester: bool = True, use_carrier: bool = False, fc: float = 1.0, fs: float = 10.0) -> NDArray[np.float64]:
+def simulate_ber_qpsk(bits: NDArray[np.float64], snr_db_values: NDArray[np.float64], ruido: NDArray[np.complex64] | None = None, use_manchester: bool = True, use_carrier: bool = False, fc: float = 1.0, fs: float = 10.0, processos: int = 1, verbose: bool = _DEBUG, rng: np.random.Generator | None = None, bits_manchester: np.ndarray | None = None) -> NDArray[np.float64]:
     """
     Simula a Taxa de Erro de Bits (BER) para modulação QPSK.
     
@@ -167,92 +423,40 @@ def simulate_ber_qpsk(bits: NDArray[np.float64], snr_db_values: NDArray[np.float
     Parâmetros:
         bits: bits de informação originais
         snr_db_values: lista de valores de SNR em dB (Eb/N0)
+        ruido: ruído gaussiano complexo normalizado; formato (N,) para uma
+               realização ou (iterações, N) para simular todas de uma vez
+               (None = sorteia uma realização com rng)
         use_manchester: se True, aplica codificação Manchester
         use_carrier: se True, adiciona portadora (modulação passa-banda)
         fc: frequência da portadora em Hz (padrão: 1.0)
         fs: taxa de amostragem (amostras por símbolo) (padrão: 10.0)
+        processos: número de processos para simular os valores de SNR (e
+                   as iterações de cada um) em paralelo (1 = tudo no
+                   processo atual)
+        verbose: se True, mostra o BER médio de cada SNR (padrão: SIM_DEBUG=1)
+        rng: gerador usado para sortear o ruído quando ruido é None
+             (None = np.random.default_rng() sem semente)
+        bits_manchester: manchester_encode(bits) já calculado, usado com
+                         use_manchester (None = codifica aqui)
     
     Retorna:
-        Lista de valores de BER para cada SNR
+        Array de BER com formato (len(snr_db_values),) + ruido.shape[:-1]:
+        um valor por SNR e por realização de ruído
     """
-    # PASSO 1: Preparar bits para transmissão
-    bits_originais = bits.copy()
-    bits_para_transmitir = bits_originais
-    
-    # Aplicar codificação Manchester se solicitado
-    if use_manchester:
-        bits_para_transmitir = manchester_encode(bits_originais)
+    modular, demodular, ajuste_es_n0_db, nome, somente_real = _modulacao_qpsk(use_manchester)
+    return _simulate_ber(bits, snr_db_values, modular, demodular, ajuste_es_n0_db, nome,
+                         ruido, use_manchester, use_carrier, fc, fs, processos, verbose, rng, bits_manchester,
+                         somente_real=somente_real)
 
-    # Lista para armazenar resultados de BER
-    resultados_ber = np.ndarray(snr_db_values.shape, np.float64)
-    
-    # Para cada valor de SNR, realizar simulação
-    for i, snr_eb_n0_db in enumerate(snr_db_values):
-        # PASSO 2: Modulação QPSK
-        # Converte bits em símbolos QPSK (2 bits por símbolo)
-        # Retorna também informação sobre padding se necessário
-        simbolos_banda_base, padding_bits = qpsk_modulate(bits_para_transmitir)
-        
-        # PASSO 2.5: Adicionar portadora (opcional)
-        # Em sistemas reais: fc >> taxa_de_símbolos (portadora muito maior)
-        # Aplica pulse shaping para tornar mais realista
-        if use_carrier:
-            sinal_transmitido = add_carrier(simbolos_banda_base, fc, fs, use_pulse_shaping=True)
-        else:
-            sinal_transmitido = simbolos_banda_base
-        
-        # PASSO 3: Conversão de Eb/N0 para Es/N0
-        # Eb/N0 = energia por bit de informação
-        # Es/N0 = energia por símbolo modulado
-        #
-        # Com Manchester: cada bit de informação vira 2 bits, que vira 1 símbolo QPSK
-        # Portanto: 1 bit info = 1 símbolo QPSK, então Es/N0 = Eb/N0
-        #
-        # Sem Manchester: 2 bits de informação vira 1 símbolo QPSK
-        # Portanto: Es = 2*Eb, então Es/N0 = Eb/N0 + 10*log10(2) ≈ Eb/N0 + 3 dB
-        if use_manchester:
-            # 1 bit de informação = 1 símbolo QPSK, sem ajuste necessário
-            snr_es_n0_db = snr_eb_n0_db
-        else:
-            # Sem Manchester: 2 bits = 1 símbolo, então a energia por símbolo é maior
-            fator_qpsk_db = 10 * np.log10(2)  # ≈ 3.01 dB
-            snr_es_n0_db = snr_eb_n0_db + fator_qpsk_db
-        
-        # PASSO 4: Simular canal com ruído AWGN
-        # Adiciona ruído gaussiano branco ao sinal transmitido
-        sinal_com_ruido = add_awgn(sinal_transmitido, snr_es_n0_db, ruido)
-        
-        # PASSO 4.5: Remover portadora (se foi adicionada)
-        # Em sistemas reais, requer sincronização precisa (PLL - Phase Locked Loop)
-        # Aplica filtro passa-baixa para remover componentes de alta frequência
-        if use_carrier:
-            simbolos_recebidos = remove_carrier(sinal_com_ruido, fc, fs, use_filtering=True)
-        else:
-            simbolos_recebidos = sinal_com_ruido
-        
-        # PASSO 5: Demodulação QPSK
-        # Converte símbolos recebidos de volta para bits
-        # Remove padding se foi adicionado durante modulação
-        bits_demodulados = qpsk_demodulate(simbolos_recebidos, padding_bits)
-        
-        # PASSO 6: Decodificação (se Manchester foi usado)
-        if use_manchester:
-            # Remove codificação Manchester para recuperar bits originais
-            bits_recebidos = manchester_decode(bits_demodulados)
-        else:
-            bits_recebidos = bits_demodulados
-        
-        # PASSO 7: Calcular BER comparando bits recebidos com bits originais
-        ber, numero_erros, total_bits = bit_error_rate(bits_originais, bits_recebidos)
-        resultados_ber[i] = ber
-    
-    return resultados_ber
 
 def run_full_simulation(
     message: str = "Trabalho de Comunicacao Digital",
     snr_values: NDArray[np.float64] = np.array([0, 2, 4, 6, 8, 10], dtype=np.float64),
     output_dir: str | None = None,
     iterations: int = 50,
+    seed: int | None = None,
+    processos: int | None = 1,
+    verbose: bool = _DEBUG,
 ):
     """
     Executa uma simulação completa de comunicação digital.
@@ -267,6 +471,13 @@ def run_full_simulation(
         message: mensagem de texto a ser transmitida
         snr_db_values: lista de valores de SNR em dB (Eb/N0) para testar
         output_dir: diretório onde salvar resultados (None = usa pasta 'output')
+        iterations: número de repetições (realizações de ruído) por valor de SNR
+        seed: semente do gerador de números aleatórios (None = não reprodutível)
+        processos: processos usados para simular os SNRs em paralelo
+                   (1 = sem paralelismo, padrão; None = um por núcleo da
+                   máquina)
+        verbose: se True, mostra o BER médio de cada SNR durante a simulação
+                 (padrão: SIM_DEBUG=1)
     
     Retorna:
         (array_SNR, array_BER_BPSK, array_BER_QPSK)
@@ -285,65 +496,115 @@ def run_full_simulation(
     print(f"Valores de SNR: {snr_values} dB")
     print("=" * 60)
 
-    bpsk_bers_snrs = np.ndarray((len(snr_values), iterations))
-    qpsk_bers_snrs = np.ndarray((len(snr_values), iterations))
-
-    for iteration in range(iterations):
-        bits_originais = text_to_bits(message)
+    # Gerar todo o ruído da simulação de uma vez, com um único gerador PCG64
+    # Cada linha do banco é a realização de ruído (complexo, variância 1 por
+    # componente) de uma iteração. O maior sinal transmitido é o BPSK com
+    # Manchester: 2 símbolos por bit de informação.
+    # Na precisão _PRECISAO: com float32 (padrão), metade da memória e do
+    # tempo de geração, e o sinal com ruído também fica em precisão simples.
+    rng = np.random.default_rng(seed)
+    # (da cache por mensagem: array somente leitura sobre os bytes guardados)
+    bits_originais = np.frombuffer(_bits_da_mensagem(message), dtype=np.uint8)
+    tamanho_ruido = 2 * len(bits_originais)
+    # Pares consecutivos de reais (real, imag) vistos como complexos, sem cópia
+    banco_ruido = rng.standard_normal(size=(iterations, 2 * tamanho_ruido), dtype=_PRECISAO).view(_PRECISAO_COMPLEXA)
 
-        ruido_real = np.random.randn(len(message) * 1024)
-        ruido_imag = np.random.randn(len(message) * 1024)
-        ruido = ruido_real + np.complex128(1j) * ruido_imag
+    # Codificação Manchester feita uma única vez e compartilhada por BPSK e
+    # QPSK (os bits codificados só são lidos)
+    bits_manchester = manchester_encode(bits_originais)
 
-        resultados_ber_bpsk = simulate_ber_bpsk(bits_originais, snr_values, ruido, use_manchester=True, use_carrier=False)
-        resultados_ber_qpsk = simulate_ber_qpsk(bits_originais, snr_values, ruido, use_manchester=True, use_carrier=False)
+    # Simular todas as iterações de uma vez: o sinal transmitido é o mesmo em
+    # todas, só muda a realização de ruído (uma linha do banco por iteração)
+    # Resultado: matriz (len(snr_values), iterations) com o BER de cada iteração
+    # BPSK e QPSK não compartilham estado, e os valores de SNR de cada uma são
+    # independentes: com processos > 1, as tarefas (modulação, SNR, faixa de
+    # iterações) das duas varreduras vão para um único multiprocessing.Pool,
+    # com no máximo `processos` processos (o resultado é o mesmo, pois o
+    # ruído já foi sorteado)
+    if processos is None:
+        processos = os.cpu_count() or 1
+    if processos > 1:
+        resultados_por_modulacao = []
+        destinos = []
+        argumentos = []
+        for modular, demodular, ajuste_es_n0_db, nome, somente_real in (_modulacao_bpsk(True, False), _modulacao_qpsk(True)):
+            sinal_transmitido, ruido, snrs_es_n0_db, padding_bits = _preparar_simulacao(
+                bits_originais, snr_values, modular, ajuste_es_n0_db, banco_ruido, True, False, 1.0, 10.0, None, bits_manchester, somente_real)
+            resultados_ber = np.empty((len(snr_values), iterations), np.float64)
+            destinos_modulacao, argumentos_modulacao = _tarefas_paralelas(
+                sinal_transmitido, ruido, snrs_es_n0_db, bits_originais, demodular, padding_bits, True, False, 1.0, 10.0, processos)
+            resultados_por_modulacao.append((nome, resultados_ber))
+            destinos.extend((resultados_ber, destino) for destino in destinos_modulacao)
+            argumentos.extend(argumentos_modulacao)
+        with multiprocessing.Pool(processes=min(processos, len(argumentos))) as pool:
+            bers_por_tarefa = pool.starmap(_ber_por_snr, argumentos)
+        for (resultados_ber, destino), bers_tarefa in zip(destinos, bers_por_tarefa):
+            resultados_ber[destino] = bers_tarefa[0]
+        if verbose:
+            for nome, resultados_ber in resultados_por_modulacao:
+                _mostrar_bers(nome, snr_values, resultados_ber)
+        (_, bpsk_bers_snrs), (_, qpsk_bers_snrs) = resultados_por_modulacao
+    else:
+        bpsk_bers_snrs = simulate_ber_bpsk(bits_originais, snr_values, banco_ruido, use_manchester=True, use_carrier=False, verbose=verbose, bits_manchester=bits_manchester)
+        qpsk_bers_snrs = simulate_ber_qpsk(bits_originais, snr_values, banco_ruido, use_manchester=True, use_carrier=False, verbose=verbose, bits_manchester=bits_manchester)
 
-        for i, snr in enumerate(snr_values):
-            bpsk_bers_snrs[i][iteration] = resultados_ber_bpsk[i]
-            qpsk_bers_snrs[i][iteration] = resultados_ber_qpsk[i]
-
-        print(f"Iteração {iteration + 1}/{iterations} concluída")
-            
     avg_ber_bpsk = np.mean(bpsk_bers_snrs, axis=1)
     avg_ber_qpsk = np.mean(qpsk_bers_snrs, axis=1)
     
     # Salvar resultados em arquivo de texto
     caminho_arquivo_texto = os.path.join(output_dir, "ber_results_bpsk_qpsk.txt")
-    with open(caminho_arquivo_texto, "w", encoding="utf-8") as arquivo:
-        # Cabeçalho do arquivo
-        arquivo.write("SNR (dB)\tBER_BPSK\tBER_BPSK (%)\tBER_QPSK\tBER_QPSK (%)")
-
-        arquivo.write('\n')
-        # Escrever cada linha de resultados
-        for snr, bpsk_ber, qpsk_ber in zip(snr_values, avg_ber_bpsk, avg_ber_qpsk):
-            arquivo.write(f"{snr:.1f}\t\t{bpsk_ber:.6f}\t\t{bpsk_ber*100:.2f}%\t\t{qpsk_ber:.6f}\t\t{qpsk_ber*100:.2f}%")
-            arquivo.write('\n')
+    # Uma linha por SNR: SNR, BER e BER (%) de cada modulação, formatadas e
+    # gravadas por np.savetxt a partir de uma única matriz de resultados
+    tabela = np.column_stack([snr_values, avg_ber_bpsk, avg_ber_bpsk * 100, avg_ber_qpsk, avg_ber_qpsk * 100])
+    np.savetxt(
+        caminho_arquivo_texto,
+        tabela,
+        fmt=["%.1f", "%.6f", "%.2f%%", "%.6f", "%.2f%%"],
+        delimiter="\t\t",
+        header="SNR (dB)\tBER_BPSK\tBER_BPSK (%)\tBER_QPSK\tBER_QPSK (%)",
+        comments="",
+        encoding="utf-8",
+    )
 
     print(f"Resultados salvos em: {caminho_arquivo_texto}")
 
     # Gerar gráfico comparativo
+    # matplotlib só é importado aqui: processos que só simulam (workers do
+    # multiprocessing) não pagam o tempo de importação nem a memória dele
+    # Backend sem janela: o gráfico só é salvo em arquivo, então não é preciso
+    # carregar Tk/Qt (Agg é o mais rápido para gerar PNG)
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     caminho_grafico = os.path.join(output_dir, "ber_curve_bpsk_qpsk.png")
     
-    # Criar figura
-    plt.figure()
+    # Criar figura (métodos da figura e dos eixos direto, sem passar pelo
+    # estado global do pyplot)
+    fig, ax = plt.subplots()
     
-    avg_ber_bpsk = np.mean(bpsk_bers_snrs, axis=1)
-    avg_ber_qpsk = np.mean(qpsk_bers_snrs, axis=1)
     # Plotar curvas BER x SNR em escala logarítmica
-    plt.semilogy(snr_values, avg_ber_bpsk, marker="o", label="BPSK", linewidth=2, linestyle="-")
-    plt.semilogy(snr_values, avg_ber_qpsk, marker="s", label="QPSK", linewidth=2, linestyle="-")
-
+    # Escala definida uma vez e todas as curvas (colunas de curvas_ber)
+    # desenhadas em uma única chamada de ax.plot, com um só ajuste de limites;
+    # marcador e legenda de cada curva são definidos depois, nas linhas criadas
+    # (BERs médios reaproveitados da tabela acima)
+    curvas_ber = np.column_stack([avg_ber_bpsk, avg_ber_qpsk])
+    ax.set_yscale("log")
+    linhas = ax.plot(snr_values, curvas_ber, linewidth=2, linestyle="-")
+    for linha, marcador, rotulo in zip(linhas, ("o", "s"), ("BPSK", "QPSK")):
+        linha.set_marker(marcador)
+        linha.set_label(rotulo)
     
     # Configurar eixos e título
-    plt.xlabel("SNR (dB)", fontsize=12)
-    plt.ylabel("BER", fontsize=12)
-    plt.grid(True, which="both", alpha=0.3)
-    plt.legend(fontsize=11)
-    plt.title("Curva BER x SNR – BPSK vs QPSK (com Manchester)", fontsize=13)
+    ax.set_xlabel("SNR (dB)", fontsize=12)
+    ax.set_ylabel("BER", fontsize=12)
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend(fontsize=11)
+    ax.set_title("Curva BER x SNR – BPSK vs QPSK (com Manchester)", fontsize=13)
     
     # Salvar gráfico
-    plt.savefig(caminho_grafico, dpi=150, bbox_inches="tight")
-    plt.close()
+    fig.savefig(caminho_grafico, dpi=150, bbox_inches="tight")
+    plt.close(fig)
     print(f"Gráfico salvo em: {caminho_grafico}")
     
     # Finalização
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.modulation import add_carrier, bpsk_demodulate, qpsk_demodulate, qpsk_modulate, remove_carrier
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.complex64, np.complex128, np.longdouble])
+def test_bpsk_demodulate_zeros_com_sinal(dtype):
+    # -0.0 e +0.0 decidem pelo limiar >= 0 (bit 1), qualquer que seja o tipo
+    simbolos = np.array([-1.0, -0.0, 0.0, 1.0], dtype=dtype)
+    np.testing.assert_array_equal(bpsk_demodulate(simbolos), [0, 1, 1, 1])
+
+
+@pytest.mark.parametrize("dtype", [np.complex64, np.complex128, np.clongdouble, np.dtype(">c16")])
+def test_qpsk_demodulate_zeros_com_sinal(dtype):
+    # Re/Im iguais a -0.0 ou +0.0 contam como não negativos: par (0, 0)
+    simbolos = np.array([complex(0.0, -0.0), complex(-0.0, 0.0), complex(-0.0, -0.0), complex(-1.0, -1.0)], dtype=dtype)
+    np.testing.assert_array_equal(qpsk_demodulate(simbolos), [0, 0, 0, 0, 0, 0, 1, 1])
+
+
+def test_qpsk_demodulate_zeros_com_sinal_reais():
+    # Entrada real (parte imaginária zero): só Re decide o segundo bit
+    simbolos = np.array([-0.0, 0.0, -1.0])
+    np.testing.assert_array_equal(qpsk_demodulate(simbolos), [0, 0, 0, 0, 0, 1])
+
+
+def test_qpsk_remove_carrier_sem_filtro_nao_depende_do_tipo():
+    # Sem filtro, a componente Q do símbolo 0 sai -0.0 (-sin(0) * sinal):
+    # o primeiro par continua (0, 0) em qualquer precisão
+    simbolos, padding = qpsk_modulate(np.array([0, 0, 1, 1]), dtype=np.complex128)
+    for dtype in (np.float32, np.float64):
+        transmitido = add_carrier(simbolos, 1.0, 10.0, dtype=dtype)
+        recebido = remove_carrier(transmitido, 1.0, 10.0, use_filtering=False, dtype=dtype)
+        assert np.signbit(recebido[0].imag)
+        np.testing.assert_array_equal(qpsk_demodulate(recebido, padding)[:2], [0, 0])
+        np.testing.assert_array_equal(qpsk_demodulate(recebido.astype(np.clongdouble), padding)[:2], [0, 0])